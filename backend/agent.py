@@ -11,12 +11,15 @@ Groq tool calling format (OpenAI-compatible):
   Then inject: {"role": "tool", "tool_call_id": ..., "content": result}
 """
 
+import asyncio
 import json
 import os
 from datetime import datetime
 from typing import Optional
 
-from groq import Groq
+import orjson
+import pandas as pd
+from groq import AsyncGroq
 
 from monday_client import MondayClient
 from data_cleaner import (
@@ -39,7 +42,8 @@ TOOLS = [
                 "Fetch ALL live items from a Monday.com board. "
                 "Use board='deals' for the Deal Funnel pipeline, "
                 "or board='workorders' for the Work Order Tracker. "
-                "Makes a LIVE API call every time — no caching. "
+                "Makes a LIVE API call; repeat requests for the same board "
+                "within one question reuse that fetch. "
                 "Returns cleaned, normalised rows as JSON."
             ),
             "parameters": {
@@ -120,40 +124,70 @@ BOARD 2 — Work Order Tracker (workorders):
 
 # ── Tool executor ─────────────────────────────────────────────────────────
 
+# Fields returned to the model per board (see SYSTEM); raw/_id/flag columns
+# stay in the DataFrame for the quality report but cost tokens for nothing.
+_OUT_COLS = {
+    "deals": [
+        "deal_name", "owner_code", "client_code", "status", "stage",
+        "stage_group", "sector", "deal_value", "closure_probability",
+        "created_date", "tentative_close_date",
+    ],
+    "workorders": [
+        "deal_name", "customer_code", "serial_no", "execution_status",
+        "sector", "type_of_work", "amount_excl_gst", "amount_incl_gst",
+        "billed_incl_gst", "collected", "receivable", "billing_status",
+        "wo_status", "personnel_code",
+    ],
+}
+
 async def _run_tool(
     name: str,
     args: dict,
-    monday_key: str,
+    client: MondayClient,
     deals_board_id: str,
     wo_board_id: str,
-) -> dict:
+) -> tuple[dict, Optional[pd.DataFrame]]:
+    """
+    Execute one tool call. Returns (payload for the model, cleaned DataFrame).
+    The DataFrame is only set for get_board_items; the caller keeps it for
+    the quality report instead of re-cleaning the returned rows.
+    """
     board_map = {"deals": deals_board_id, "workorders": wo_board_id}
-    client = MondayClient(api_key=monday_key)
 
     if name == "get_board_columns":
-        return await client.get_columns(board_map[args["board"]])
+        return await client.get_columns(board_map[args["board"]]), None
 
     if name == "get_board_items":
         board_id = board_map[args["board"]]
-        raw = await client.get_all_items(board_id)
+        # Column-wise, so the cleaners build the DataFrame without per-row dicts
+        raw = await client.get_all_items_columnar(board_id)
         if args["board"] == "deals":
             df   = clean_deals(raw)
-            rows = df.where(df.notna(), None).to_dict(orient="records")
         else:
             df   = clean_workorders(raw)
-            rows = df.where(df.notna(), None).to_dict(orient="records")
-        
-        # Truncate to avoid Groq TPM limits (12k tokens max)
-        truncated_rows = rows[:30]
+
+        # Only the fields the model works with, and truncate to avoid
+        # Groq TPM limits (12k tokens max)
+        cols = [c for c in _OUT_COLS[args["board"]] if c in df.columns]
+        truncated_rows = _records(df[cols].head(30))
         return {
             "board": args["board"], 
-            "total_rows": len(rows), 
+            "total_rows": len(df), 
             "returned_rows": len(truncated_rows),
             "note": "Output truncated to 30 rows due to API token limits",
             "rows": truncated_rows
-        }
+        }, df
 
-    return {"error": f"Unknown tool: {name}"}
+    return {"error": f"Unknown tool: {name}"}, None
+
+
+def _records(df: pd.DataFrame) -> list[dict]:
+    """DataFrame → list of row dicts with NaN/NA as None, in one pass."""
+    cols = df.columns.tolist()
+    return [
+        {c: (None if v is None or v is pd.NA or v != v else v) for c, v in zip(cols, tup)}
+        for tup in df.itertuples(index=False, name=None)
+    ]
 
 
 # ── Agent ─────────────────────────────────────────────────────────────────
@@ -161,25 +195,75 @@ async def _run_tool(
 class BIAgent:
     def __init__(
         self,
-        groq_key: str,
         monday_key: str,
         deals_board_id: str,
         wo_board_id: str,
+        monday_client: Optional[MondayClient] = None,
+        groq_client: Optional[AsyncGroq] = None,
+        groq_key: Optional[str] = None,
     ):
-        self.client        = Groq(api_key=groq_key)
-        self.monday_key    = monday_key
+        # Pass shared clients to make the agent a cheap per-request object;
+        # it only closes the clients it created itself. groq_key is only
+        # needed without groq_client (AsyncGroq falls back to GROQ_API_KEY).
+        self.client        = groq_client or AsyncGroq(api_key=groq_key)
+        self._owns_groq    = groq_client is None
+        self.monday        = monday_client or MondayClient(api_key=monday_key)
+        self._owns_monday  = monday_client is None
         self.deals_id      = deals_board_id
         self.wo_id         = wo_board_id
 
+    async def aclose(self) -> None:
+        """Close the Groq and Monday clients if this agent created them."""
+        if self._owns_groq:
+            await self.client.close()
+        if self._owns_monday:
+            await self.monday.aclose()
+
     async def query(self, user_message: str, history: list[dict]) -> dict:
         """
         Agentic loop using Groq function calling.
         Returns {answer, trace, quality}.
         """
+        async for kind, payload in self._run(user_message, history, stream=False):
+            if kind == "done":
+                return payload
+
+    async def stream(self, user_message: str, history: list[dict]):
+        """
+        Same agentic loop as query(), yielded as Server-Sent Event frames:
+          data: {"token": ...}     — answer text as Groq generates it
+          event: reset             — discard the tokens so far: that turn
+                                     ended in tool calls, so it wasn't the answer
+          event: trace             — each trace event as it happens
+          event: done              — {answer, quality} once the turn completes
+        """
+        async for kind, payload in self._run(user_message, history, stream=True):
+            if kind == "token":
+                yield _sse({"token": payload})
+            elif kind == "reset":
+                yield _sse({}, "reset")
+            elif kind == "trace":
+                yield _sse(payload, "trace")
+            else:
+                yield _sse({"answer": payload["answer"], "quality": payload["quality"]}, "done")
+
+    async def _run(self, user_message: str, history: list[dict], stream: bool):
+        """
+        Core tool loop. Yields (kind, payload) pairs:
+          ("trace", event) for every trace event,
+          ("token", text)  for answer text (stream=True only),
+          ("reset", None)  after a streamed turn whose text preceded tool calls,
+          ("done", {answer, trace, quality}) exactly once, last.
+        """
         trace: list[dict] = []
         fetched_deals_df = None
         fetched_wo_df    = None
 
+        # Per-question memo: the model often re-requests a board it already
+        # fetched in an earlier loop iteration. Tasks (not results) are cached
+        # so identical calls within one turn also share a single fetch.
+        tool_cache: dict[tuple, asyncio.Task] = {}
+
         # Build messages in OpenAI format
         messages = [{"role": "system", "content": SYSTEM}]
         for h in history:
@@ -193,56 +277,95 @@ class BIAgent:
             loop_count += 1
 
             # ── Call Groq ────────────────────────────────────────────────
-            response = self.client.chat.completions.create(
+            response = await self.client.chat.completions.create(
                 model=MODEL,
                 messages=messages,
                 tools=TOOLS,
                 tool_choice="auto",
                 max_tokens=4096,
                 temperature=0.2,
+                stream=stream,
             )
 
-            msg     = response.choices[0].message
-            finish  = response.choices[0].finish_reason
+            if stream:
+                # We only learn whether this is the final turn from the
+                # response itself, so every turn streams: content deltas go
+                # straight to the client, tool-call deltas are reassembled.
+                parts: list[str] = []
+                calls: dict[int, dict] = {}
+                finish = None
+                async for chunk in response:
+                    if not chunk.choices:
+                        continue
+                    delta  = chunk.choices[0].delta
+                    finish = chunk.choices[0].finish_reason or finish
+                    if delta.content:
+                        parts.append(delta.content)
+                        yield "token", delta.content
+                    for d in delta.tool_calls or []:
+                        call = calls.setdefault(d.index, {
+                            "id":       "",
+                            "type":     "function",
+                            "function": {"name": "", "arguments": ""},
+                        })
+                        if d.id:
+                            call["id"] = d.id
+                        if d.function and d.function.name:
+                            call["function"]["name"] += d.function.name
+                        if d.function and d.function.arguments:
+                            call["function"]["arguments"] += d.function.arguments
+                content    = "".join(parts)
+                tool_calls = [calls[i] for i in sorted(calls)]
+                # Text streamed before tool calls is narration, not the answer
+                if parts and tool_calls and finish != "stop":
+                    yield "reset", None
+            else:
+                msg        = response.choices[0].message
+                finish     = response.choices[0].finish_reason
+                content    = msg.content
+                tool_calls = [
+                    {
+                        "id":       tc.id,
+                        "type":     "function",
+                        "function": {
+                            "name":      tc.function.name,
+                            "arguments": tc.function.arguments,
+                        }
+                    }
+                    for tc in msg.tool_calls or []
+                ]
 
             # ── No tool calls → final answer ─────────────────────────────
-            if finish == "stop" or not msg.tool_calls:
-                answer = msg.content or "⚠️ No response generated."
+            if finish == "stop" or not tool_calls:
+                answer = content or "⚠️ No response generated."
                 trace.append(_event("answer", {"text": answer}, "Groq→Agent"))
+                yield "trace", trace[-1]
 
                 quality = None
                 if fetched_deals_df is not None or fetched_wo_df is not None:
-                    import pandas as pd
                     d_df = fetched_deals_df   if fetched_deals_df is not None else pd.DataFrame()
                     w_df = fetched_wo_df      if fetched_wo_df    is not None else pd.DataFrame()
                     quality = quality_report(d_df, w_df)
 
-                return {"answer": answer, "trace": trace, "quality": quality}
+                yield "done", {"answer": answer, "trace": trace, "quality": quality}
+                return
 
             # ── Execute each tool call ────────────────────────────────────
             # Add assistant message with tool_calls to history
             messages.append({
                 "role":       "assistant",
-                "content":    msg.content or "",
-                "tool_calls": [
-                    {
-                        "id":       tc.id,
-                        "type":     "function",
-                        "function": {
-                            "name":      tc.function.name,
-                            "arguments": tc.function.arguments,
-                        }
-                    }
-                    for tc in msg.tool_calls
-                ]
+                "content":    content or "",
+                "tool_calls": tool_calls,
             })
 
-            for tc in msg.tool_calls:
-                fn_name = tc.function.name
+            pending = []
+            for tc in tool_calls:
+                fn_name = tc["function"]["name"]
                 try:
-                    args = json.loads(tc.function.arguments)
-                except json.JSONDecodeError:
+                    args = orjson.loads(tc["function"]["arguments"] or "{}")
+                except orjson.JSONDecodeError:
                     args = {}
+                pending.append((tc, fn_name, args))
 
                 trace.append(_event("tool_call", {
                     "tool":   fn_name,
@@ -250,25 +373,44 @@ class BIAgent:
                     "reason": args.get("reason", ""),
                     "input":  args,
                 }, "Agent→Monday.com"))
-
-                try:
-                    result = await _run_tool(
+                yield "trace", trace[-1]
+
+            # Independent tool calls (e.g. deals + workorders) run concurrently
+            keys = []
+            for _, fn_name, args in pending:
+                key = (fn_name, json.dumps(
+                    {k: v for k, v in args.items() if k != "reason"}, sort_keys=True,
+                ))
+                if key not in tool_cache:
+                    tool_cache[key] = asyncio.ensure_future(_run_tool(
                         fn_name, args,
-                        self.monday_key,
+                        self.monday,
                         self.deals_id,
                         self.wo_id,
-                    )
+                    ))
+                keys.append(key)
+            results = await asyncio.gather(
+                *(tool_cache[key] for key in keys), return_exceptions=True,
+            )
+            # Failed fetches are retried if the model asks again
+            for key, result in zip(keys, results):
+                if isinstance(result, Exception):
+                    tool_cache.pop(key, None)
+
+            for (tc, fn_name, args), result in zip(pending, results):
+                try:
+                    if isinstance(result, Exception):
+                        raise result
+                    result, df = result
 
                     # Trace + capture DataFrames for quality report
                     if fn_name == "get_board_items" and "rows" in result:
                         board = args.get("board")
                         rows  = result["rows"]
                         if board == "deals":
-                            import pandas as pd
-                            fetched_deals_df = clean_deals(rows) if rows else pd.DataFrame()
+                            fetched_deals_df = df
                         elif board == "workorders":
-                            import pandas as pd
-                            fetched_wo_df = clean_workorders(rows) if rows else pd.DataFrame()
+                            fetched_wo_df = df
 
                         trace.append(_event("tool_result", {
                             "tool":         fn_name,
@@ -293,25 +435,27 @@ class BIAgent:
                             "result": result,
                         }, "Monday.com→Agent"))
 
-                    result_str = json.dumps(result, default=str)
+                    result_str = _dumps(result)
 
                 except Exception as exc:
                     err_msg = str(exc)
-                    result_str = json.dumps({"error": err_msg})
+                    result_str = _dumps({"error": err_msg})
                     trace.append(_event("tool_error", {
                         "tool":  fn_name,
                         "error": err_msg,
                     }, "Error"))
 
+                yield "trace", trace[-1]
+
                 # Inject tool result back into message history
                 messages.append({
                     "role":         "tool",
-                    "tool_call_id": tc.id,
+                    "tool_call_id": tc["id"],
                     "content":      result_str,
                 })
 
         # Safety: if loop limit hit
-        return {
+        yield "done", {
             "answer": "⚠️ Agent loop limit reached. Please try a more specific question.",
             "trace":  trace,
             "quality": None,
@@ -325,3 +469,18 @@ def _event(kind: str, content: dict, source: str) -> dict:
         "content":   content,
         "timestamp": datetime.now().isoformat(),
     }
+
+
+def _dumps(obj) -> str:
+    """Serialise a tool result for the model (numpy scalars handled natively)."""
+    return orjson.dumps(
+        obj,
+        default=str,
+        option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY,
+    ).decode()
+
+
+def _sse(data: dict, event: Optional[str] = None) -> str:
+    """Format one Server-Sent Event frame."""
+    frame = f"event: {event}\n" if event else ""
+    return frame + f"data: {json.dumps(data, default=str)}\n\n"
@@ -12,9 +12,13 @@ Handles:
 """
 
 import re
+from functools import lru_cache
 from typing import Optional
 
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
 
 
 # ── Constants ──────────────────────────────────────────────────────────────
@@ -37,6 +41,15 @@ DEAL_STAGE_MAP = {
     "o": "O – Not Relevant At All",
 }
 
+# Pipeline funnel buckets, checked in order against the lower-cased stage label
+STAGE_GROUPS = [
+    ("Early Stage",     ("lead generated", "sales qualified")),
+    ("Qualification",   ("demo", "feasibility")),
+    ("Active Pursuit",  ("proposal", "negotiat", "poc")),
+    ("Won/Execution",   ("work order", "project won", "invoice", "amount accrued")),
+    ("Closed/Inactive", ("lost", "not relevant", "on hold")),
+]
+
 # Rows that are header repeats embedded in data
 _SENTINEL_DEAL_STATUS  = {"deal status", "deal_status"}
 _SENTINEL_DEAL_STAGE   = {"deal stage", "deal_stage"}
@@ -52,6 +65,16 @@ ONGOING_WO_STATUSES    = {"ongoing", "in progress", "executed until current mont
                           "partial completed", "pause / struck",
                           "details pending from client"}
 
+# Currency symbols / thousands separators / whitespace stripped before float()
+_NUM_STRIP     = re.compile(r"[₹$€£,\s]")
+# The same set for Arrow's RE2 engine, whose \s is ASCII-only: \p{Z} plus
+# the few control characters Python's \s also matches (\v, \x85, \x1c-\x1f)
+_NUM_STRIP_RE2 = r"[₹$€£,\s\v\p{Z}\x{85}\x{1c}-\x{1f}]"
+# What float() accepts once stripped (decimal / exponent form)
+_NUM_LITERAL   = r"^[+-]?(\d+\.?\d*|\.\d+)([eE][+-]?\d+)?$"
+# Lettered stage prefix, e.g. "B. Sales Qualified Lead" → "b"
+_STAGE_LETTER  = re.compile(r"^([a-zA-Z])\.")
+
 
 # ── Number helpers ─────────────────────────────────────────────────────────
 
@@ -59,7 +82,13 @@ def parse_number(value) -> Optional[float]:
     """₹1,23,456.78 → 123456.78. Returns None on failure."""
     if value is None or (isinstance(value, float) and pd.isna(value)):
         return None
-    s = re.sub(r"[₹$€£,\s]", "", str(value)).strip()
+    s = str(value)
+    # Monday "numbers" columns already hold plain numeric text — skip the strip
+    try:
+        return float(s)
+    except ValueError:
+        pass
+    s = _NUM_STRIP.sub("", s)
     if not s:
         return None
     try:
@@ -68,6 +97,18 @@ def parse_number(value) -> Optional[float]:
         return None
 
 
+def parse_number_series(s: pd.Series) -> pd.Series:
+    """
+    Vectorised parse_number over a whole column. Failures become NaN.
+    Strip, validate and cast all run in Arrow's compiled string kernels.
+    """
+    arr     = pa.array(s.astype("string[pyarrow]"))
+    cleaned = pc.replace_substring_regex(arr, _NUM_STRIP_RE2, "")
+    valid   = pc.match_substring_regex(cleaned, _NUM_LITERAL)
+    nums    = pc.cast(pc.if_else(valid, cleaned, None), pa.float64())
+    return pd.Series(nums.to_numpy(zero_copy_only=False), index=s.index, dtype="float64")
+
+
 def fmt_inr(value: Optional[float]) -> str:
     """Format float as ₹ with Cr/L shorthand for readability."""
     if value is None:
@@ -84,7 +125,7 @@ def fmt_inr(value: Optional[float]) -> str:
 def normalise_stage(stage: Optional[str]) -> Optional[str]:
     if not stage:
         return None
-    m = re.match(r"^([a-zA-Z])\.", str(stage).strip())
+    m = _STAGE_LETTER.match(str(stage).strip())
     if m:
         code = m.group(1).lower()
         return DEAL_STAGE_MAP.get(code, stage)
@@ -96,19 +137,32 @@ def stage_group(stage: Optional[str]) -> str:
     if not stage:
         return "Unknown"
     s = str(stage).lower()
-    if any(x in s for x in ["lead generated", "sales qualified"]):
-        return "Early Stage"
-    if any(x in s for x in ["demo", "feasibility"]):
-        return "Qualification"
-    if any(x in s for x in ["proposal", "negotiat", "poc"]):
-        return "Active Pursuit"
-    if any(x in s for x in ["work order", "project won", "invoice", "amount accrued"]):
-        return "Won/Execution"
-    if any(x in s for x in ["lost", "not relevant", "on hold"]):
-        return "Closed/Inactive"
+    for group, needles in STAGE_GROUPS:
+        if any(x in s for x in needles):
+            return group
     return "Other"
 
 
+def normalise_stage_series(stage: pd.Series) -> pd.Series:
+    """Vectorised normalise_stage over a whole column."""
+    codes  = stage.astype("string").str.strip().str.extract(_STAGE_LETTER, expand=False)
+    mapped = codes.str.lower().map(DEAL_STAGE_MAP).astype(object)
+    out    = mapped.where(mapped.notna(), stage)
+    return out.where(out.notna() & out.ne(""), None)
+
+
+def stage_group_series(stage: pd.Series) -> pd.Series:
+    """Vectorised stage_group over a whole column."""
+    low   = stage.astype("string").str.lower()
+    masks = [
+        low.str.contains("|".join(map(re.escape, needles)), regex=True, na=False).to_numpy(bool)
+        for _, needles in STAGE_GROUPS
+    ]
+    groups = np.select(masks, [g for g, _ in STAGE_GROUPS], default="Other")
+    empty  = (stage.isna() | stage.eq("")).to_numpy(bool)
+    return pd.Series(np.where(empty, "Unknown", groups), index=stage.index, dtype=object)
+
+
 # ── Sector normalisation ───────────────────────────────────────────────────
 
 def normalise_sector(sector: Optional[str]) -> Optional[str]:
@@ -120,53 +174,148 @@ def normalise_sector(sector: Optional[str]) -> Optional[str]:
     return s.title()
 
 
+def normalise_sector_series(sector: pd.Series) -> pd.Series:
+    """Vectorised normalise_sector over a whole column."""
+    s = sector.str.strip()
+    return s.str.title().mask(s.str.lower().isin(_SENTINEL_SECTOR) | sector.eq(""))
+
+
+# ── Column mapping ─────────────────────────────────────────────────────────
+# (canonical, predicate) rules tried in order against the lower/underscored
+# source column name; the first match wins, unmatched columns keep their name.
+
+_DEAL_RENAME_RULES = [
+    ("deal_name",            lambda lc: lc in ("deal_name", "_name")),
+    ("owner_code",           lambda lc: "owner" in lc),
+    ("client_code",          lambda lc: "client" in lc or "company" in lc),
+    ("status",               lambda lc: lc == "deal_status"),
+    ("close_date_actual",    lambda lc: "close_date" in lc and "tentative" not in lc and "actual" not in lc),
+    ("closure_probability",  lambda lc: "closure_probability" in lc or "probability" in lc),
+    ("deal_value_raw",       lambda lc: "masked_deal_value" in lc or "deal_value" in lc or "value" in lc),
+    ("tentative_close_date", lambda lc: "tentative" in lc and "close" in lc),
+    ("stage_raw",            lambda lc: lc == "deal_stage"),
+    ("product",              lambda lc: "product" in lc),
+    ("sector_raw",           lambda lc: "sector" in lc or "service" in lc),
+    ("created_date",         lambda lc: "created" in lc),
+]
+
+_WO_RENAME_RULES = [
+    ("deal_name",            lambda lc: "deal_name" in lc or lc == "_name"),
+    ("customer_code",        lambda lc: "customer" in lc or ("company" in lc and "name" in lc)),
+    ("serial_no",            lambda lc: "serial" in lc),
+    ("nature_of_work",       lambda lc: "nature" in lc),
+    ("execution_status",     lambda lc: "execution_status" in lc),
+    ("sector_raw",           lambda lc: "sector" in lc),
+    ("type_of_work",         lambda lc: "type_of_work" in lc),
+    ("amount_excl_gst_raw",  lambda lc: "amount" in lc and "excl" in lc and "billed" not in lc and "be_billed" not in lc),
+    ("amount_incl_gst_raw",  lambda lc: "amount" in lc and "incl" in lc and "billed" not in lc and "be_billed" not in lc and "collected" not in lc),
+    ("billed_excl_gst_raw",  lambda lc: "billed_value" in lc and "excl" in lc),
+    ("billed_incl_gst_raw",  lambda lc: "billed_value" in lc and "incl" in lc),
+    ("collected_raw",        lambda lc: "collected_amount" in lc or ("collected" in lc and "amount" in lc)),
+    ("receivable_raw",       lambda lc: "amount_receivable" in lc or "receivable" in lc),
+    ("wo_status",            lambda lc: "wo_status" in lc or ("status" in lc and "billed" in lc)),
+    ("collection_status",    lambda lc: "collection_status" in lc or ("collection" in lc and "status" in lc)),
+    ("billing_status",       lambda lc: "billing_status" in lc),
+    ("personnel_code",       lambda lc: "personnel" in lc or "kam" in lc or "bd" in lc),
+    ("po_date",              lambda lc: "po" in lc or "loi" in lc),
+    ("last_invoice_date",    lambda lc: "invoice_date" in lc or ("invoice" in lc and "date" in lc)),
+]
+
+
+def _canonical_columns(columns, rules) -> dict[str, str]:
+    """Map each source column to its canonical name using the first matching rule."""
+    rename = {}
+    for col in columns:
+        lc = col.lower().replace(" ", "_")
+        rename[col] = next((canon for canon, match in rules if match(lc)), col)
+    return rename
+
+
+# Canonical columns each cleaner relies on; added as all-None when absent
+_DEAL_REQUIRED = ("deal_name", "status", "stage_raw", "sector_raw", "deal_value_raw",
+                  "closure_probability", "owner_code")
+_WO_REQUIRED   = ("deal_name", "execution_status", "sector_raw",
+                  "amount_excl_gst_raw", "amount_incl_gst_raw",
+                  "billed_incl_gst_raw", "collected_raw", "receivable_raw",
+                  "billing_status", "wo_status")
+
+
+def _schema(columns, rules, required) -> tuple[dict[str, str], tuple[str, ...]]:
+    """(rename map, required canonical columns the source lacks)."""
+    rename  = _canonical_columns(columns, rules)
+    present = set(rename.values())
+    return rename, tuple(c for c in required if c not in present)
+
+
+# A board's column set is stable between calls, so the schema work above is
+# done once per distinct set of source columns.
+@lru_cache(maxsize=32)
+def _deal_schema(columns: frozenset) -> tuple[dict[str, str], tuple[str, ...]]:
+    return _schema(columns, _DEAL_RENAME_RULES, _DEAL_REQUIRED)
+
+
+@lru_cache(maxsize=32)
+def _wo_schema(columns: frozenset) -> tuple[dict[str, str], tuple[str, ...]]:
+    return _schema(columns, _WO_RENAME_RULES, _WO_REQUIRED)
+
+
+def _frame(rows: list[dict] | dict[str, list]) -> pd.DataFrame:
+    """
+    Rows from one board share a schema (Monday returns every column for every
+    item), so take the column set from the first row instead of letting
+    pandas union the keys of every row. Column-wise input (from
+    MondayClient.get_all_items_columnar) is used as-is.
+    """
+    if isinstance(rows, dict):
+        # Empty like the row path when there are no items, whatever the keys
+        return pd.DataFrame(rows) if len(next(iter(rows.values()), [])) else pd.DataFrame()
+    if not rows:
+        return pd.DataFrame()
+    return pd.DataFrame.from_records(rows, columns=list(rows[0]))
+
+
+def _arrow_strings(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Store text columns as Arrow-backed strings so the .str / .isin chains
+    below run in Arrow kernels. Missing values become pd.NA — convert with
+    .astype(object) before handing rows to JSON.
+    """
+    str_cols = df.select_dtypes(include="object").columns
+    if len(str_cols):
+        df[str_cols] = df[str_cols].astype("string[pyarrow]")
+    return df
+
+
+def _mask_by(col: pd.Series, values: set) -> pd.Series:
+    """
+    Case-insensitive .isin for a categorical column: the lower-case test runs
+    once per distinct category, then rows are matched on their integer codes.
+    """
+    good = np.flatnonzero(col.cat.categories.str.lower().isin(values))
+    return col.cat.codes.isin(good)
+
+
 # ── Deals cleaner ──────────────────────────────────────────────────────────
 
-def clean_deals(rows: list[dict]) -> pd.DataFrame:
+def clean_deals(rows: list[dict] | dict[str, list]) -> pd.DataFrame:
     """
-    Accept raw rows (from Monday.com or XLSX-import fallback).
+    Accept raw rows (from Monday.com or XLSX-import fallback), or the
+    column-wise dict from get_all_items_columnar.
     Returns a clean DataFrame with enriched columns.
     """
-    df = pd.DataFrame(rows)
+    df = _frame(rows)
 
     # Rename to canonical names regardless of casing quirks
-    rename = {c: c for c in df.columns}
-    for col in df.columns:
-        lc = col.lower().replace(" ", "_")
-        if lc in ("deal_name", "_name"):
-            rename[col] = "deal_name"
-        elif "owner" in lc:
-            rename[col] = "owner_code"
-        elif "client" in lc or "company" in lc:
-            rename[col] = "client_code"
-        elif lc == "deal_status":
-            rename[col] = "status"
-        elif "close_date" in lc and "tentative" not in lc and "actual" not in lc:
-            rename[col] = "close_date_actual"
-        elif "closure_probability" in lc or "probability" in lc:
-            rename[col] = "closure_probability"
-        elif "masked_deal_value" in lc or "deal_value" in lc or "value" in lc:
-            rename[col] = "deal_value_raw"
-        elif "tentative" in lc and "close" in lc:
-            rename[col] = "tentative_close_date"
-        elif lc == "deal_stage":
-            rename[col] = "stage_raw"
-        elif "product" in lc:
-            rename[col] = "product"
-        elif "sector" in lc or "service" in lc:
-            rename[col] = "sector_raw"
-        elif "created" in lc:
-            rename[col] = "created_date"
-
+    rename, missing = _deal_schema(frozenset(df.columns))
     df = df.rename(columns=rename)
     # Drop duplicate columns that might result from renaming
     df = df.loc[:, ~df.columns.duplicated(keep='last')]
 
     # Ensure required columns exist
-    for col in ["deal_name", "status", "stage_raw", "sector_raw", "deal_value_raw",
-                "closure_probability", "owner_code"]:
-        if col not in df.columns:
-            df[col] = None
+    for col in missing:
+        df[col] = None
+
+    df = _arrow_strings(df)
 
     # Drop sentinel rows (header-repeat rows embedded in data)
     mask = (
@@ -177,99 +326,57 @@ def clean_deals(rows: list[dict]) -> pd.DataFrame:
     df = df[~mask].reset_index(drop=True)
 
     # Clean + normalise
-    df["status"]              = df["status"].str.strip().str.title()
-    df["deal_value"]          = df["deal_value_raw"].apply(parse_number)
-    df["stage"]               = df["stage_raw"].apply(normalise_stage)
-    df["stage_group"]         = df["stage"].apply(stage_group)
-    df["sector"]              = df["sector_raw"].apply(normalise_sector)
+    df["status"]              = df["status"].str.strip().str.title().astype("category")
+    df["deal_value"]          = parse_number_series(df["deal_value_raw"])
+    df["stage"]               = normalise_stage_series(df["stage_raw"])
+    df["stage_group"]         = stage_group_series(df["stage"])
+    df["sector"]              = normalise_sector_series(df["sector_raw"])
     df["closure_probability"] = df["closure_probability"].str.strip().str.title()
 
-    # Classify status
-    df["is_open"]    = df["status"].str.lower().isin(ACTIVE_DEAL_STATUSES)
-    df["is_won"]     = df["status"].str.lower().isin(WON_DEAL_STATUSES)
-    df["is_dead"]    = df["status"].str.lower().isin(DEAD_DEAL_STATUSES)
-    df["is_on_hold"] = df["status"].str.lower().isin(ON_HOLD_STATUSES)
+    # Classify status (a handful of distinct values → compare category codes)
+    df["is_open"]    = _mask_by(df["status"], ACTIVE_DEAL_STATUSES)
+    df["is_won"]     = _mask_by(df["status"], WON_DEAL_STATUSES)
+    df["is_dead"]    = _mask_by(df["status"], DEAD_DEAL_STATUSES)
+    df["is_on_hold"] = _mask_by(df["status"], ON_HOLD_STATUSES)
 
     return df
 
 
 # ── Work Orders cleaner ────────────────────────────────────────────────────
 
-def clean_workorders(rows: list[dict]) -> pd.DataFrame:
+def clean_workorders(rows: list[dict] | dict[str, list]) -> pd.DataFrame:
     """
-    Accept raw rows from Monday.com (after column normalisation).
+    Accept raw rows from Monday.com (after column normalisation), as a
+    list of dicts or the column-wise dict from get_all_items_columnar.
     Returns a clean DataFrame.
     """
-    df = pd.DataFrame(rows)
-
-    rename = {c: c for c in df.columns}
-    for col in df.columns:
-        lc = col.lower().replace(" ", "_")
-        if "deal_name" in lc or lc == "_name":
-            rename[col] = "deal_name"
-        elif "customer" in lc or ("company" in lc and "name" in lc):
-            rename[col] = "customer_code"
-        elif "serial" in lc:
-            rename[col] = "serial_no"
-        elif "nature" in lc:
-            rename[col] = "nature_of_work"
-        elif "execution_status" in lc:
-            rename[col] = "execution_status"
-        elif "sector" in lc:
-            rename[col] = "sector_raw"
-        elif "type_of_work" in lc:
-            rename[col] = "type_of_work"
-        elif "amount" in lc and "excl" in lc and "billed" not in lc and "be_billed" not in lc:
-            rename[col] = "amount_excl_gst_raw"
-        elif "amount" in lc and "incl" in lc and "billed" not in lc and "be_billed" not in lc and "collected" not in lc:
-            rename[col] = "amount_incl_gst_raw"
-        elif "billed_value" in lc and "excl" in lc:
-            rename[col] = "billed_excl_gst_raw"
-        elif "billed_value" in lc and "incl" in lc:
-            rename[col] = "billed_incl_gst_raw"
-        elif "collected_amount" in lc or ("collected" in lc and "amount" in lc):
-            rename[col] = "collected_raw"
-        elif "amount_receivable" in lc or "receivable" in lc:
-            rename[col] = "receivable_raw"
-        elif "wo_status" in lc or ("status" in lc and "billed" in lc):
-            rename[col] = "wo_status"
-        elif "collection_status" in lc or ("collection" in lc and "status" in lc):
-            rename[col] = "collection_status"
-        elif "billing_status" in lc:
-            rename[col] = "billing_status"
-        elif "personnel" in lc or "kam" in lc or "bd" in lc:
-            rename[col] = "personnel_code"
-        elif "po" in lc or "loi" in lc:
-            rename[col] = "po_date"
-        elif "invoice_date" in lc or ("invoice" in lc and "date" in lc):
-            rename[col] = "last_invoice_date"
+    df = _frame(rows)
 
+    rename, missing = _wo_schema(frozenset(df.columns))
     df = df.rename(columns=rename)
     # Drop duplicate columns that might result from renaming
     df = df.loc[:, ~df.columns.duplicated(keep='last')]
 
     # Ensure columns exist
-    for col in ["deal_name", "execution_status", "sector_raw",
-                "amount_excl_gst_raw", "amount_incl_gst_raw",
-                "billed_incl_gst_raw", "collected_raw", "receivable_raw",
-                "billing_status", "wo_status"]:
-        if col not in df.columns:
-            df[col] = None
+    for col in missing:
+        df[col] = None
+
+    df = _arrow_strings(df)
 
     # Parse financials
-    df["amount_excl_gst"]  = df["amount_excl_gst_raw"].apply(parse_number)
-    df["amount_incl_gst"]  = df["amount_incl_gst_raw"].apply(parse_number)
-    df["billed_incl_gst"]  = df["billed_incl_gst_raw"].apply(parse_number)
-    df["collected"]        = df["collected_raw"].apply(parse_number)
-    df["receivable"]       = df["receivable_raw"].apply(parse_number)
+    df["amount_excl_gst"]  = parse_number_series(df["amount_excl_gst_raw"])
+    df["amount_incl_gst"]  = parse_number_series(df["amount_incl_gst_raw"])
+    df["billed_incl_gst"]  = parse_number_series(df["billed_incl_gst_raw"])
+    df["collected"]        = parse_number_series(df["collected_raw"])
+    df["receivable"]       = parse_number_series(df["receivable_raw"])
 
     # Normalise
-    df["sector"]           = df["sector_raw"].apply(normalise_sector)
-    df["execution_status"] = df["execution_status"].str.strip()
+    df["sector"]           = normalise_sector_series(df["sector_raw"])
+    df["execution_status"] = df["execution_status"].str.strip().astype("category")
 
     # Status booleans
-    df["is_completed"] = df["execution_status"].str.lower().isin(COMPLETED_WO_STATUSES)
-    df["is_ongoing"]   = df["execution_status"].str.lower().isin(ONGOING_WO_STATUSES)
+    df["is_completed"] = _mask_by(df["execution_status"], COMPLETED_WO_STATUSES)
+    df["is_ongoing"]   = _mask_by(df["execution_status"], ONGOING_WO_STATUSES)
 
     # Fillna financials to 0 for aggregation
     for col in ["amount_excl_gst", "amount_incl_gst", "billed_incl_gst",
@@ -283,27 +390,31 @@ def clean_workorders(rows: list[dict]) -> pd.DataFrame:
 
 def quality_report(deals_df: pd.DataFrame, wo_df: pd.DataFrame) -> dict:
     """Return a structured data-quality summary."""
-    def _completeness(df: pd.DataFrame) -> float:
-        total = df.shape[0] * df.shape[1]
+    # Non-null counts per column, computed once and shared by the
+    # completeness % and the missing-value checks below
+    deals_filled = deals_df.count()
+    wo_filled    = wo_df.count()
+
+    def _completeness(df: pd.DataFrame, filled: pd.Series) -> float:
+        total = df.size
         if total == 0:
             return 100.0
-        filled = df.notna().sum().sum()
-        return round(filled / total * 100, 1)
+        return round(filled.sum() / total * 100, 1)
 
     issues = []
 
     # Deals
     if not deals_df.empty:
         if "deal_value" in deals_df.columns:
-            missing_val = deals_df["deal_value"].isna().sum()
+            missing_val = len(deals_df) - deals_filled["deal_value"]
             if missing_val:
                 issues.append(f"{missing_val} deals have no deal value")
         if "sector" in deals_df.columns:
-            missing_sector = deals_df["sector"].isna().sum()
+            missing_sector = len(deals_df) - deals_filled["sector"]
             if missing_sector:
                 issues.append(f"{missing_sector} deals have no sector")
         if "stage" in deals_df.columns:
-            missing_stage = deals_df["stage"].isna().sum()
+            missing_stage = len(deals_df) - deals_filled["stage"]
             if missing_stage:
                 issues.append(f"{missing_stage} deals have no stage")
 
@@ -321,7 +432,7 @@ def quality_report(deals_df: pd.DataFrame, wo_df: pd.DataFrame) -> dict:
     return {
         "deals_rows":            len(deals_df),
         "wo_rows":               len(wo_df),
-        "deals_completeness":    f"{_completeness(deals_df)}%",
-        "wo_completeness":       f"{_completeness(wo_df)}%",
+        "deals_completeness":    f"{_completeness(deals_df, deals_filled)}%",
+        "wo_completeness":       f"{_completeness(wo_df, wo_filled)}%",
         "issues":                issues,
     }
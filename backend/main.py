@@ -1,30 +1,59 @@
 """
 main.py — Skylark BI Agent (Groq)
-FastAPI backend. Serves frontend + exposes /api/query.
+FastAPI backend. Serves frontend + exposes /api/query and /api/query/stream (SSE).
 
 Credential resolution order:
   1. HTTP headers (X-Monday-Key, X-Deals-Board, X-Wo-Board)
   2. Environment variables
 """
 
+import json
 import os
 import sys
+from collections import OrderedDict
+from contextlib import asynccontextmanager
 from typing import Optional
 
 # Ensure that local modules within backend/ can be imported directly
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 import httpx
-from groq import AuthenticationError as GroqAuthError, RateLimitError as GroqRateLimit
+from groq import AsyncGroq, AuthenticationError as GroqAuthError, RateLimitError as GroqRateLimit
 from dotenv import load_dotenv
 from fastapi import FastAPI, Header, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse
 from fastapi.staticfiles import StaticFiles
 from pydantic import BaseModel
 
 load_dotenv()
 
-app = FastAPI(title="Skylark BI Agent (Groq)", version="3.0.0")
+from agent import BIAgent
+from monday_client import MondayClient, make_http_client
+
+
+# Monday keys come from request headers, so only the most recently used few
+# keep a client (and its cached column titles); they all share one pool
+MAX_MONDAY_CLIENTS = 16
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Long-lived clients so requests reuse pooled connections to Groq /
+    # api.monday.com instead of reconnecting each time. The Groq key is the
+    # server's own, so one client serves every request; the Monday pool is
+    # key-independent, so every MondayClient borrows the same one.
+    groq_key = os.getenv("GROQ_API_KEY", "")
+    app.state.groq           = AsyncGroq(api_key=groq_key) if groq_key else None
+    app.state.monday_http    = make_http_client()
+    app.state.monday_clients = OrderedDict()
+    yield
+    if app.state.groq is not None:
+        await app.state.groq.close()
+    await app.state.monday_http.aclose()
+
+
+app = FastAPI(title="Skylark BI Agent (Groq)", version="3.0.0", lifespan=lifespan)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],
@@ -46,6 +75,22 @@ def _resolve(header_val: Optional[str], env_key: str) -> str:
     return (header_val or "").strip() or os.getenv(env_key, "").strip()
 
 
+def _monday_client(monday_key: str) -> MondayClient:
+    """
+    Shared MondayClient for this API key (LRU). Eviction only drops the
+    client's column cache — the pool is app-wide, so requests still using
+    an evicted client are unaffected.
+    """
+    clients = app.state.monday_clients
+    if monday_key in clients:
+        clients.move_to_end(monday_key)
+        return clients[monday_key]
+    clients[monday_key] = MondayClient(api_key=monday_key, http=app.state.monday_http)
+    while len(clients) > MAX_MONDAY_CLIENTS:
+        clients.popitem(last=False)
+    return clients[monday_key]
+
+
 # ── Routes ────────────────────────────────────────────────────────────────
 
 @app.get("/api/health")
@@ -77,8 +122,7 @@ async def verify_boards(
     if not monday_key:
         return {"deals": "error: no API key", "workorders": "error: no API key"}
 
-    from monday_client import MondayClient
-    client = MondayClient(api_key=monday_key)
+    client = _monday_client(monday_key)
     results = {}
 
     for name, board_id in [("deals", deals_board_id), ("workorders", wo_board_id)]:
@@ -97,44 +141,92 @@ async def verify_boards(
     return results
 
 
-@app.post("/api/query")
-async def query(
-    req: QueryRequest,
-    x_monday_key:  Optional[str] = Header(None),
-    x_deals_board: Optional[str] = Header(None),
-    x_wo_board:    Optional[str] = Header(None),
-):
+async def _agent_for(
+    x_monday_key:  Optional[str],
+    x_deals_board: Optional[str],
+    x_wo_board:    Optional[str],
+) -> BIAgent:
+    """
+    Resolve credentials and build this request's BIAgent, or raise HTTPException.
+    The agent is a cheap wrapper over the shared Groq / Monday clients, so
+    board ids travel with the request instead of keying a cache.
+    """
     monday_key     = _resolve(x_monday_key,  "MONDAY_API_KEY")
-    groq_key       = os.getenv("GROQ_API_KEY", "")
     deals_board_id = _resolve(x_deals_board, "DEALS_BOARD_ID")
     wo_board_id    = _resolve(x_wo_board,    "WORKORDERS_BOARD_ID")
 
     if not monday_key:
         raise HTTPException(400, "Monday.com API key is required")
-    if not groq_key:
+    if app.state.groq is None:
         raise HTTPException(500, "GROQ_API_KEY is not set on the server")
     if not deals_board_id or not wo_board_id:
         raise HTTPException(400, "Both board IDs are required (Deals + Work Orders)")
 
-    from agent import BIAgent
-    agent = BIAgent(
-        groq_key       = groq_key,
+    return BIAgent(
         monday_key     = monday_key,
         deals_board_id = deals_board_id,
         wo_board_id    = wo_board_id,
+        monday_client  = _monday_client(monday_key),
+        groq_client    = app.state.groq,
     )
 
+
+def _error_for(exc: Exception) -> HTTPException:
+    """Map agent/upstream exceptions to the HTTP error surfaced to the UI."""
+    if isinstance(exc, GroqAuthError):
+        return HTTPException(401, "Invalid Groq API key — check GROQ_API_KEY")
+    if isinstance(exc, GroqRateLimit):
+        return HTTPException(429, "Groq rate limit hit — please wait a moment and retry")
+    if isinstance(exc, httpx.TimeoutException):
+        return HTTPException(504, "Monday.com API timed out — try again")
+    return HTTPException(500, str(exc))
+
+
+@app.post("/api/query")
+async def query(
+    req: QueryRequest,
+    x_monday_key:  Optional[str] = Header(None),
+    x_deals_board: Optional[str] = Header(None),
+    x_wo_board:    Optional[str] = Header(None),
+):
+    agent = await _agent_for(x_monday_key, x_deals_board, x_wo_board)
+
     try:
         result = await agent.query(req.message, req.history)
         return result
-    except GroqAuthError:
-        raise HTTPException(401, "Invalid Groq API key — check GROQ_API_KEY")
-    except GroqRateLimit:
-        raise HTTPException(429, "Groq rate limit hit — please wait a moment and retry")
-    except httpx.TimeoutException:
-        raise HTTPException(504, "Monday.com API timed out — try again")
     except Exception as exc:
-        raise HTTPException(500, str(exc))
+        raise _error_for(exc)
+
+
+@app.post("/api/query/stream")
+async def query_stream(
+    req: QueryRequest,
+    x_monday_key:  Optional[str] = Header(None),
+    x_deals_board: Optional[str] = Header(None),
+    x_wo_board:    Optional[str] = Header(None),
+):
+    """
+    Streaming variant of /api/query (text/event-stream).
+    Answer tokens arrive as they are generated; trace events and the final
+    {answer, quality} payload arrive as `trace` / `done` events.
+    Failures after the stream has started are sent as an `error` event.
+    """
+    agent = await _agent_for(x_monday_key, x_deals_board, x_wo_board)
+
+    async def gen():
+        try:
+            async for frame in agent.stream(req.message, req.history):
+                yield frame
+        except Exception as exc:
+            err = _error_for(exc)
+            payload = {"status": err.status_code, "detail": err.detail}
+            yield f"event: error\ndata: {json.dumps(payload)}\n\n"
+
+    return StreamingResponse(
+        gen(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
 
 
 # ── Serve frontend ────────────────────────────────────────────────────────
@@ -7,69 +7,227 @@ We fetch column titles separately via the board columns query, then map by id.
 """
 
 import os
-import json
+import asyncio
 import re
+import time
 import httpx
-from typing import Optional
+import orjson
+from functools import lru_cache
+from contextlib import aclosing
+from typing import Any, AsyncIterator, Callable, Optional
 from datetime import datetime
 
 MONDAY_API_URL = "https://api.monday.com/v2"
 API_VERSION    = "2024-10"   # latest stable — fixes "Cannot query field title" error
+COL_MAP_TTL    = 300         # seconds a board's column titles are reused
+
+
+# ── Item queries ──────────────────────────────────────────────────────────
+# Column titles and the first page share one request (aliased selections on
+# $b); continuation pages go through next_items_page. NOTE: no 'title' in
+# column_values. __VARS__ / __COLS__ / __COLUMN_VALUES__ are filled by
+# _items_queries; __COLS__ is dropped when the title map is already cached.
+
+_FIRST_PAGE_Q = """
+query ($b: ID!, $limit: Int!__VARS__) {__COLS__
+  first: boards(ids: [$b]) {
+    items_page(limit: $limit) {
+      cursor
+      items {
+        id
+        name
+        __COLUMN_VALUES__ { id text value }
+      }
+    }
+  }
+}"""
+
+_NEXT_PAGE_Q = """
+query ($limit: Int!, $cursor: String!__VARS__) {
+  next_items_page(limit: $limit, cursor: $cursor) {
+    cursor
+    items {
+      id
+      name
+      __COLUMN_VALUES__ { id text value }
+    }
+  }
+}"""
+
+
+_COLS_SELECTION = """
+  cols: boards(ids: [$b]) {
+    name
+    columns { id title type }
+  }"""
+
+
+@lru_cache(maxsize=None)
+def _items_queries(filtered: bool, with_cols: bool = True) -> tuple[str, str]:
+    """(first-page, next-page) query strings, optionally filtered by $cols."""
+    vars_, cv = (", $cols: [String!]", "column_values(ids: $cols)") if filtered \
+        else ("", "column_values")
+    cols = _COLS_SELECTION if with_cols else ""
+    return tuple(
+        q.replace("__VARS__", vars_).replace("__COLS__", cols)
+         .replace("__COLUMN_VALUES__", cv)
+        for q in (_FIRST_PAGE_Q, _NEXT_PAGE_Q)
+    )
 
 
 # ── Normalisation helpers ─────────────────────────────────────────────────
 
+# Placeholder strings Monday renders for an empty cell
+_BLANK = frozenset(("", "—", "-", "null", "None"))
+
+
+@lru_cache(maxsize=4096)
+def _parse_value(raw: str):
+    # Text-less columns (mirrors, relations, blank statuses) repeat the same
+    # value payload across items — each distinct string is decoded once.
+    # Callers only read the result, so sharing it is safe.
+    return orjson.loads(raw)
+
+
 def _extract_text(col: dict) -> Optional[str]:
     """Pull the best human-readable string from a column_values entry."""
-    text = col.get("text")
-    if text and str(text).strip():
-        return str(text).strip()
+    # Common path: `text` is already a str from the JSON decode
+    t = col.get("text")
+    if isinstance(t, str):
+        t = t.strip()
+        if t:
+            return t
 
     raw = col.get("value")
-    if raw:
-        try:
-            parsed = json.loads(raw)
-            if isinstance(parsed, dict):
-                for key in ("text", "name", "label", "display_value"):
-                    v = parsed.get(key)
-                    if v and str(v).strip():
-                        return str(v).strip()
-            elif isinstance(parsed, (int, float)):
-                return str(parsed)
-            elif isinstance(parsed, str) and parsed.strip():
-                return parsed.strip()
-        except (json.JSONDecodeError, TypeError):
-            pass
+    if not raw:
+        return None
+    try:
+        parsed = _parse_value(raw)
+    except (orjson.JSONDecodeError, TypeError):
+        return None
+
+    if isinstance(parsed, dict):
+        for key in ("text", "name", "label", "display_value"):
+            v = parsed.get(key)
+            if v and str(v).strip():
+                return str(v).strip()
+    elif isinstance(parsed, (int, float)):
+        return str(parsed)
+    elif isinstance(parsed, str) and parsed.strip():
+        return parsed.strip()
+    return None
 
+
+def _plain_text(col: dict) -> Optional[str]:
+    """Columns whose `text` is the whole value — an empty text is an empty cell."""
+    t = col.get("text")
+    if isinstance(t, str):
+        return t.strip() or None
     return None
 
 
-def _row_from_item(item: dict, col_id_to_title: dict) -> dict:
-    """Convert a raw Monday.com item → clean flat dict using column title map."""
-    row = {
-        "_id":   item.get("id"),
-        "_name": (item.get("name") or "").strip(),
+# Column type → extractor. Scalar types skip the `value` JSON fallback;
+# anything else (status, dropdown, mirror, board_relation, …) is generic.
+_EXTRACTORS: dict[str, Callable[[dict], Optional[str]]] = {
+    "text":      _plain_text,
+    "long_text": _plain_text,
+    "numbers":   _plain_text,
+    "date":      _plain_text,
+}
+
+
+def _resolve(col_map: dict[str, tuple[str, str]]) -> dict[str, tuple[str, Callable]]:
+    """{col_id: (title, type)} → {col_id: (title, extractor)}."""
+    return {
+        cid: (title, _EXTRACTORS.get(ctype, _extract_text))
+        for cid, (title, ctype) in col_map.items()
     }
-    for col in item.get("column_values", []):
-        col_id = col.get("id", "unknown")
-        # Use the pre-fetched title map; fall back to id if missing
-        title = col_id_to_title.get(col_id, col_id)
-        text  = _extract_text(col)
-
-        if text is None or str(text).strip() in ("", "—", "-", "null", "None"):
-            row[title] = None
-        else:
-            row[title] = text
 
-    return row
+
+def _normalize_page(items: list[dict], col_map: dict[str, tuple[str, str]]) -> list[dict]:
+    """Convert one page of raw items — run in a worker thread by iter_all_items."""
+    # Title and extractor are resolved once per page; the per-column work is
+    # then a single dict lookup bound to a local
+    lookup, blank = _resolve(col_map).get, _BLANK
+    rows: list[dict] = []
+    append = rows.append
+    for item in items:
+        row = {"_id": item.get("id"), "_name": (item.get("name") or "").strip()}
+        for col in item.get("column_values", []):
+            # Columns outside the map weren't asked for
+            hit = lookup(col.get("id", "unknown"))
+            if hit is None:
+                continue
+            title, extract = hit
+            text = extract(col)   # already stripped
+            row[title] = None if text is None or text in blank else text
+        append(row)
+    return rows
+
+
+def _normalize_columns(items: list[dict], col_map: dict[str, tuple[str, str]]) -> dict[str, list]:
+    """
+    Column-oriented _normalize_page: {"_id": [...], "_name": [...], title: [...]}
+    with one pre-sized list per column, so a DataFrame can be built from it
+    without going through a dict per row.
+    """
+    resolved = _resolve(col_map)
+    titles   = list(dict.fromkeys(title for title, _ in resolved.values()))
+    pos      = {title: k for k, title in enumerate(titles)}
+    lookup   = {cid: (pos[title], extract) for cid, (title, extract) in resolved.items()}.get
+    blank, n = _BLANK, len(items)
+
+    data = [[None] * n for _ in titles]
+    for i, item in enumerate(items):
+        for col in item.get("column_values", []):
+            hit = lookup(col.get("id", "unknown"))
+            if hit is None:
+                continue
+            k, extract = hit
+            text = extract(col)
+            data[k][i] = None if text is None or text in blank else text
+
+    return {
+        "_id":   [item.get("id") for item in items],
+        "_name": [(item.get("name") or "").strip() for item in items],
+        **dict(zip(titles, data)),
+    }
 
 
 # ── Client ───────────────────────────────────────────────────────────────
 
+def make_http_client() -> httpx.AsyncClient:
+    """
+    Pooled connection to api.monday.com. Nothing in it depends on the API
+    key (Authorization is sent per request), so one can serve every key.
+    """
+    # HTTP/2 multiplexes prefetched pages and concurrent boards over one TLS
+    # connection; repetitive column_values JSON compresses well
+    return httpx.AsyncClient(
+        http2=True,
+        timeout=httpx.Timeout(45),
+        headers={
+            "Content-Type":    "application/json",
+            "API-Version":     API_VERSION,
+            "Accept-Encoding": "gzip, br",
+        },
+        limits=httpx.Limits(max_keepalive_connections=32, max_connections=64),
+    )
+
+
 class MondayClient:
-    """Async Monday.com GraphQL client — compatible with API version 2024-10."""
+    """
+    Async Monday.com GraphQL client — compatible with API version 2024-10.
+
+    One pooled httpx.AsyncClient is reused for every call (all pagination
+    pages included). Use as `async with MondayClient(...) as c:` for scoped
+    work, or keep an instance around and call aclose() when done.
 
-    def __init__(self, api_key: Optional[str] = None):
+    Pass `http` (see make_http_client) to share one pool between clients;
+    a shared pool is left open by aclose() and belongs to whoever made it.
+    """
+
+    def __init__(self, api_key: Optional[str] = None, http: Optional[httpx.AsyncClient] = None):
         self.api_key = api_key or os.getenv("MONDAY_API_KEY", "")
         if not self.api_key:
             raise ValueError("Monday API key is required")
@@ -78,6 +236,37 @@ class MondayClient:
             "Content-Type":  "application/json",
             "API-Version":   API_VERSION,
         }
+        # Created on first use (unless shared) and kept for the client's
+        # lifetime so calls reuse pooled connections instead of a fresh
+        # TCP+TLS handshake each
+        self._client: Optional[httpx.AsyncClient] = http
+        self._owns_client = http is None
+        self._closed      = False
+        # board_id → (fetched at, board name, {col_id: (title, type)}), shared
+        # by get_columns and the item queries; see invalidate_columns()
+        self._col_map_cache: dict[str, tuple[float, str, dict[str, tuple[str, str]]]] = {}
+
+    async def __aenter__(self) -> "MondayClient":
+        self._http()
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        await self.aclose()
+
+    def _http(self) -> httpx.AsyncClient:
+        # Never reopen after aclose(): a fresh pool here would have no owner
+        if self._closed:
+            raise RuntimeError("MondayClient is closed")
+        if self._client is None:
+            self._client = make_http_client()
+        return self._client
+
+    async def aclose(self) -> None:
+        """Close the pooled HTTP connection if this client owns it (safe to call more than once)."""
+        self._closed = True
+        if self._client is not None and self._owns_client:
+            await self._client.aclose()
+        self._client = None
 
     async def _gql(self, query: str, variables: dict | None = None) -> dict:
         """Execute a GraphQL query. Raises RuntimeError on API errors."""
@@ -85,8 +274,13 @@ class MondayClient:
         if variables:
             payload["variables"] = variables
 
-        async with httpx.AsyncClient(timeout=45) as client:
-            resp = await client.post(MONDAY_API_URL, json=payload, headers=self.headers)
+        # orjson on both directions — Content-Type / API-Version are pool
+        # headers; the key goes per request so the pool can be shared
+        resp = await self._http().post(
+            MONDAY_API_URL,
+            content=orjson.dumps(payload),
+            headers={"Authorization": self.api_key},
+        )
 
         # Surface HTTP errors with body context
         if resp.status_code != 200:
@@ -94,97 +288,208 @@ class MondayClient:
                 f"Monday.com HTTP {resp.status_code}: {resp.text[:300]}"
             )
 
-        data = resp.json()
+        data = orjson.loads(resp.content)
         if "errors" in data:
-            raise RuntimeError(f"Monday.com API error: {json.dumps(data['errors'])}")
+            raise RuntimeError(
+                f"Monday.com API error: {orjson.dumps(data['errors']).decode()}"
+            )
 
         return data.get("data", {})
 
     # ── Column schema ───────────────────────────────────────────────────
 
     async def get_columns(self, board_id: str) -> dict:
-        """Return board name + columns list (id, title, type)."""
-        q = """
-        query ($b: ID!) {
-          boards(ids: [$b]) {
-            name
-            columns { id title type }
-          }
-        }"""
-        data = await self._gql(q, {"b": board_id})
-        boards = data.get("boards", [])
-        if not boards:
-            return {"error": f"Board {board_id} not found or not accessible"}
+        """Return board name + columns list (id, title, type), cached for COL_MAP_TTL."""
+        cached = self._cached_board(board_id)
+        if cached is None:
+            q = """
+            query ($b: ID!) {
+              boards(ids: [$b]) {
+                name
+                columns { id title type }
+              }
+            }"""
+            data = await self._gql(q, {"b": board_id})
+            boards = data.get("boards", [])
+            if not boards:
+                return {"error": f"Board {board_id} not found or not accessible"}
+            cached = self._cache_board(board_id, boards[0])
+        name, col_map = cached
         return {
-            "board_name": boards[0]["name"],
-            "columns":    boards[0]["columns"],
+            "board_name": name,
+            "columns": [
+                {"id": cid, "title": title, "type": ctype}
+                for cid, (title, ctype) in col_map.items()
+            ],
         }
 
-    async def _fetch_col_map(self, board_id: str) -> dict[str, str]:
-        """Return {col_id: col_title} for a board."""
-        result = await self.get_columns(board_id)
-        if "error" in result:
-            return {}
-        return {c["id"]: c["title"] for c in result.get("columns", [])}
+    def _cache_board(self, board_id: str, board: dict) -> tuple[str, dict[str, tuple[str, str]]]:
+        """Store a boards{name columns} result; returns (name, col_map)."""
+        col_map = {c["id"]: (c["title"], c["type"]) for c in board.get("columns", [])}
+        name    = board.get("name", "")
+        self._col_map_cache[board_id] = (time.monotonic(), name, col_map)
+        return name, col_map
+
+    def _cached_board(self, board_id: str) -> Optional[tuple[str, dict[str, tuple[str, str]]]]:
+        hit = self._col_map_cache.get(board_id)
+        if hit is None or time.monotonic() - hit[0] > COL_MAP_TTL:
+            return None
+        return hit[1], hit[2]
+
+    def invalidate_columns(self, board_id: Optional[str] = None) -> None:
+        """Forget cached column titles for one board (or all) after a schema change."""
+        if board_id is None:
+            self._col_map_cache.clear()
+        else:
+            self._col_map_cache.pop(board_id, None)
 
     # ── Item fetching with cursor pagination ────────────────────────────
 
-    async def get_all_items(self, board_id: str, page_size: int = 100) -> list[dict]:
+    async def get_all_items(
+        self, board_id: str, page_size: int = 100, columns: Optional[list[str]] = None
+    ) -> list[dict]:
         """
-        Fetch ALL items from a board using cursor pagination.
-        Fetches column titles first to map col_id → readable title.
-        Returns list of clean flat dicts.
+        Fetch ALL items from a board as a list of clean flat dicts.
+        See iter_all_items — prefer it when rows can be consumed as they arrive.
+
+        Every page goes over the same pooled connection, e.g.
+            async with MondayClient(api_key) as c:
+                rows = await c.get_all_items(board_id)
         """
-        # Step 1: get column id→title map
-        col_map = await self._fetch_col_map(board_id)
-
-        all_rows: list[dict] = []
-        cursor: Optional[str] = None
-
-        while True:
-            if cursor:
-                # Pagination continuation — NOTE: no 'title' in column_values
-                q = """
-                query ($limit: Int!, $cursor: String!) {
-                  next_items_page(limit: $limit, cursor: $cursor) {
-                    cursor
-                    items {
-                      id
-                      name
-                      column_values { id text value }
-                    }
-                  }
-                }"""
-                data = await self._gql(q, {"limit": page_size, "cursor": cursor})
-                page = data.get("next_items_page", {})
-            else:
-                q = """
-                query ($b: ID!, $limit: Int!) {
-                  boards(ids: [$b]) {
-                    items_page(limit: $limit) {
-                      cursor
-                      items {
-                        id
-                        name
-                        column_values { id text value }
-                      }
-                    }
-                  }
-                }"""
-                data = await self._gql(q, {"b": board_id, "limit": page_size})
-                boards = data.get("boards", [])
-                if not boards:
-                    raise RuntimeError(
-                        f"Board {board_id} returned no data. "
-                        "Check the board ID and that your API token has access to it."
+        return [row async for row in self.iter_all_items(board_id, page_size, columns)]
+
+    async def iter_all_items(
+        self, board_id: str, page_size: int = 100, columns: Optional[list[str]] = None
+    ) -> AsyncIterator[dict]:
+        """
+        Yield every item of a board as a clean flat dict, using cursor pagination.
+        Column titles come back with the first page and map col_id → readable title.
+        Only about one page of rows is held at a time.
+
+        Pass `columns` (column ids) to fetch only those column_values — fewer
+        bytes on the wire and fewer values to normalise per row.
+        """
+        async with aclosing(
+            self._iter_pages(board_id, page_size, columns, _normalize_page)
+        ) as pages:
+            async for rows in pages:
+                for row in rows:
+                    yield row
+
+    async def get_all_items_columnar(
+        self, board_id: str, page_size: int = 100, columns: Optional[list[str]] = None
+    ) -> dict[str, list]:
+        """
+        Fetch ALL items from a board column-wise: {"_id": [...], "_name": [...],
+        title: [...]}, every list the same length. pd.DataFrame(result) builds
+        straight from it, skipping the per-row dicts of get_all_items.
+        """
+        out: dict[str, list] = {}
+        async with aclosing(
+            self._iter_pages(board_id, page_size, columns, _normalize_columns)
+        ) as pages:
+            async for page_cols in pages:
+                if not out:
+                    out = page_cols
+                else:
+                    for title, values in page_cols.items():
+                        out[title].extend(values)
+        return out
+
+    async def _iter_pages(
+        self,
+        board_id: str,
+        page_size: int,
+        columns: Optional[list[str]],
+        convert: Callable[[list[dict], dict], Any],
+    ) -> AsyncIterator[Any]:
+        """Page through a board, yielding convert(items, col_map) per page."""
+        # Column titles ride along with the first page unless already cached
+        cached  = self._cached_board(board_id)
+        col_map = cached[1] if cached else None
+        q_first, q_next = _items_queries(columns is not None, col_map is None)
+        extra = {"cols": list(columns)} if columns is not None else {}
+
+        # The first page stays serial: the cursor only exists after it
+        data = await self._gql(q_first, {"b": board_id, "limit": page_size, **extra})
+        boards = data.get("first", [])
+        if not boards:
+            raise RuntimeError(
+                f"Board {board_id} returned no data. "
+                "Check the board ID and that your API token has access to it."
+            )
+        if col_map is None:
+            col_boards = data.get("cols", [])
+            col_map = self._cache_board(board_id, col_boards[0])[1] if col_boards else {}
+        page = boards[0].get("items_page", {})
+        if columns is not None:
+            wanted  = set(columns)
+            col_map = {k: v for k, v in col_map.items() if k in wanted}
+        else:
+            col_map = await self._cover_columns(board_id, col_map, cached is not None, page)
+
+        next_task: Optional[asyncio.Task] = None
+        try:
+            while True:
+                items  = page.get("items", [])
+                cursor = page.get("cursor")
+
+                # Dispatch the next page before converting this one so the
+                # conversion (and the caller's work on the result) overlaps
+                # the round-trip. Converting in a thread keeps the event
+                # loop free to drive that request meanwhile.
+                next_task = None
+                if cursor and len(items) >= page_size:
+                    next_task = asyncio.create_task(
+                        self._gql(q_next, {"limit": page_size, "cursor": cursor, **extra})
                     )
-                page = boards[0].get("items_page", {})
 
-            items = page.get("items", [])
-            all_rows.extend(_row_from_item(it, col_map) for it in items)
-            cursor = page.get("cursor")
+                yield await asyncio.to_thread(convert, items, col_map)
+
+                if next_task is None:
+                    break
+                data, next_task = await next_task, None
+                page = data.get("next_items_page", {})
+        finally:
+            # Caller stopped early (or something raised) mid-prefetch
+            if next_task is not None:
+                next_task.cancel()
+
+    async def _cover_columns(
+        self, board_id: str, col_map: dict, from_cache: bool, page: dict
+    ) -> dict[str, tuple[str, str]]:
+        """
+        Make sure an unfiltered fetch keeps every column. Every item carries
+        the board's full column set, so the first one shows whether a cached
+        map predates a newly added column; that map is refetched once, and
+        ids still unknown fall back to the id as their title.
+        """
+        items = page.get("items", [])
+        ids   = [c.get("id", "unknown") for c in items[0].get("column_values", [])] if items else []
+        if from_cache and any(cid not in col_map for cid in ids):
+            self.invalidate_columns(board_id)
+            if "error" not in await self.get_columns(board_id):
+                col_map = self._cached_board(board_id)[1]
+        missing = {cid: (cid, "") for cid in ids if cid not in col_map}
+        return {**col_map, **missing} if missing else col_map
+
+    async def get_all_items_many(
+        self,
+        board_ids: list[str],
+        page_size: int = 100,
+        concurrency: int = 5,
+        columns: Optional[list[str]] = None,
+    ) -> dict[str, list[dict]]:
+        """
+        Fetch several boards at once, each through its own get_all_items
+        pipeline. At most `concurrency` boards are in flight together.
+        Returns {board_id: rows}.
+        """
+        sem = asyncio.Semaphore(concurrency)
 
-            if not cursor or len(items) < page_size:
-                break
+        async def one(board_id: str) -> list[dict]:
+            async with sem:
+                return await self.get_all_items(board_id, page_size, columns)
 
-        return all_rows
+        results = await asyncio.gather(*(one(b) for b in board_ids))
+        return dict(zip(board_ids, results))
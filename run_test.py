@@ -29,6 +29,8 @@ async def run_test():
         with open("result.txt", "w", encoding="utf-8") as f:
             f.write("--- Error ---\n")
             f.write(traceback.format_exc())
+    finally:
+        await agent.aclose()
 
 if __name__ == "__main__":
     asyncio.run(run_test())
@@ -11,29 +11,49 @@ Prints board IDs to add to your .env at the end.
 """
 
 import argparse
+import asyncio
 import json
+import re
 import sys
-import time
 from pathlib import Path
 
+import httpx
 import pandas as pd
-import requests
+from aiolimiter import AsyncLimiter
 
 API_URL = "https://api.monday.com/v2"
 
-
-def gql(api_key: str, query: str, variables: dict | None = None) -> dict:
-    headers = {
-        "Authorization": api_key,
-        "Content-Type": "application/json",
-        "API-Version": "2024-01",
-    }
-    r = requests.post(
-        API_URL,
-        json={"query": query, "variables": variables or {}},
-        headers=headers,
+# Items are created BATCH_SIZE per request (aliased mutations), CONCURRENCY
+# requests at a time, capped at RATE_PER_MIN requests per minute — the lowest
+# plan's documented minute limit. Monday rejects very large batches (~200).
+BATCH_SIZE   = 25
+CONCURRENCY  = 8
+RATE_PER_MIN = 1000
+
+_CUR_RE    = re.compile(r"[₹$€£,\s]")
+_DATE_FMTS = ("%Y-%m-%d", "%d-%m-%Y", "%m/%d/%Y", "%d/%m/%Y")
+
+
+def make_client(api_key: str) -> httpx.AsyncClient:
+    """
+    The one client every call in a run goes through: auth headers are set
+    once and its CONCURRENCY connections stay alive between requests.
+    """
+    return httpx.AsyncClient(
+        headers={
+            "Authorization": api_key,
+            "Content-Type": "application/json",
+            "API-Version": "2024-01",
+        },
         timeout=30,
+        limits=httpx.Limits(
+            max_connections=CONCURRENCY, max_keepalive_connections=CONCURRENCY
+        ),
     )
+
+
+async def gql(client: httpx.AsyncClient, query: str, variables: dict | None = None) -> dict:
+    r = await client.post(API_URL, json={"query": query, "variables": variables or {}})
     r.raise_for_status()
     data = r.json()
     if "errors" in data:
@@ -41,74 +61,185 @@ def gql(api_key: str, query: str, variables: dict | None = None) -> dict:
     return data["data"]
 
 
-def create_board(api_key: str, workspace_id: str, name: str) -> str:
+async def create_board(client: httpx.AsyncClient, workspace_id: str, name: str) -> str:
     q = """
     mutation ($name: String!, $kind: BoardKind!, $ws: ID) {
       create_board(board_name: $name, board_kind: $kind, workspace_id: $ws) {
         id
       }
     }"""
-    d = gql(api_key, q, {"name": name, "kind": "public", "ws": workspace_id})
+    d = await gql(client, q, {"name": name, "kind": "public", "ws": workspace_id})
     return d["create_board"]["id"]
 
 
-def create_column(api_key: str, board_id: str, title: str, col_type: str) -> str | None:
-    q = """
-    mutation ($b: ID!, $title: String!, $type: ColumnType!) {
-      create_column(board_id: $b, title: $title, column_type: $type) { id }
-    }"""
+async def gql_aliased(client: httpx.AsyncClient, query: str, variables: dict) -> dict:
+    """
+    Run a document of aliased fields. Unlike gql(), GraphQL errors don't
+    raise: failed aliases come back null, so the others still count.
+    """
+    r = await client.post(API_URL, json={"query": query, "variables": variables})
+    r.raise_for_status()
+    payload = r.json()
+    if "errors" in payload:
+        print(f"    ⚠ Monday error: {payload['errors']}")
+    return payload.get("data") or {}
+
+
+async def create_columns(client: httpx.AsyncClient, board_id: str,
+                         columns: list[tuple[str, str]]) -> dict[str, str]:
+    """Create every (title, type) column in one aliased mutation → {title: id}."""
+    decl = "".join(f", $t{i}: String!, $k{i}: ColumnType!" for i in range(len(columns)))
+    body = "\n      ".join(
+        f"c{i}: create_column(board_id: $b, title: $t{i}, column_type: $k{i}) {{ id }}"
+        for i in range(len(columns))
+    )
+    q = f"mutation ($b: ID!{decl}) {{\n      {body}\n    }}"
+    variables: dict = {"b": board_id}
+    for i, (title, col_type) in enumerate(columns):
+        variables[f"t{i}"] = title
+        variables[f"k{i}"] = col_type
+
     try:
-        d = gql(api_key, q, {"b": board_id, "title": title, "type": col_type})
-        return d["create_column"]["id"]
+        data = await gql_aliased(client, q, variables)
     except Exception as e:
-        print(f"    ⚠ column '{title}': {e}")
-        return None
+        print(f"    ⚠ columns: {e}")
+        return {}
 
+    col_ids: dict[str, str] = {}
+    for i, (title, _) in enumerate(columns):
+        created = data.get(f"c{i}")
+        if created:
+            col_ids[title] = created["id"]
+        else:
+            print(f"    ⚠ column '{title}' not created")
+    return col_ids
+
+
+async def create_items_batch(client: httpx.AsyncClient, sem: asyncio.Semaphore,
+                             limiter: AsyncLimiter, board_id: str,
+                             items: list[tuple[str, dict]]) -> list[bool]:
+    """
+    Create several items in one request as aliased mutations (m0, m1, …).
+    A batch uses one rate-limit slot; per-item success comes from its alias.
+    """
+    decl = "".join(f", $n{i}: String!, $cv{i}: JSON!" for i in range(len(items)))
+    body = "\n      ".join(
+        f"m{i}: create_item(board_id: $b, item_name: $n{i}, column_values: $cv{i}) {{ id }}"
+        for i in range(len(items))
+    )
+    q = f"mutation ($b: ID!{decl}) {{\n      {body}\n    }}"
+    variables: dict = {"b": board_id}
+    for i, (name, col_values) in enumerate(items):
+        cv = {k: v for k, v in col_values.items() if v is not None}
+        variables[f"n{i}"]  = name[:255]
+        variables[f"cv{i}"] = json.dumps(cv)
 
-def create_item(api_key: str, board_id: str, name: str, col_values: dict) -> bool:
-    q = """
-    mutation ($b: ID!, $name: String!, $cv: JSON!) {
-      create_item(board_id: $b, item_name: $name, column_values: $cv) { id }
-    }"""
-    cv = {k: v for k, v in col_values.items() if v is not None}
     try:
-        gql(api_key, q, {"b": board_id, "name": name[:255], "cv": json.dumps(cv)})
-        return True
+        async with sem, limiter:
+            data = await gql_aliased(client, q, variables)
     except Exception as e:
-        print(f"    ⚠ item '{name[:40]}': {e}")
-        return False
-
-
-def safe_str(v, maxlen: int = 255) -> str | None:
-    if v is None or (isinstance(v, float) and pd.isna(v)):
-        return None
-    s = str(v).strip()
-    return s[:maxlen] if s else None
-
-
-def safe_date(v) -> dict | None:
-    if v is None or (isinstance(v, float) and pd.isna(v)):
-        return None
-    import re
-    from datetime import datetime
-    s = str(v).strip()[:10]
-    for fmt in ["%Y-%m-%d", "%d-%m-%Y", "%m/%d/%Y", "%d/%m/%Y"]:
-        try:
-            return {"date": datetime.strptime(s, fmt).strftime("%Y-%m-%d")}
-        except ValueError:
-            pass
-    return None
-
-
-def safe_num(v) -> str | None:
-    if v is None or (isinstance(v, float) and pd.isna(v)):
-        return None
-    import re
-    s = re.sub(r"[₹$€£,\s]", "", str(v)).strip()
+        print(f"    ⚠ batch of {len(items)} from '{items[0][0][:40]}': {e}")
+        return [False] * len(items)
+    return [bool(data.get(f"m{i}")) for i in range(len(items))]
+
+
+async def create_items(client: httpx.AsyncClient, board_id: str,
+                       items: list[tuple[str, dict]]) -> tuple[int, int]:
+    """Create every (name, column_values) item in concurrent batches. Returns (ok, failed)."""
+    sem     = asyncio.Semaphore(CONCURRENCY)
+    limiter = AsyncLimiter(RATE_PER_MIN, 60)
+    batches = await asyncio.gather(*(
+        create_items_batch(client, sem, limiter, board_id, items[i:i + BATCH_SIZE])
+        for i in range(0, len(items), BATCH_SIZE)
+    ))
+    ok = sum(sum(b) for b in batches)
+    return ok, len(items) - ok
+
+
+def load_sheet(path: str, header: int = 0) -> pd.DataFrame:
+    """
+    Read an .xlsx, caching it as Parquet beside the source. Later runs read
+    the cache while it is newer than the spreadsheet.
+    """
+    src   = Path(path)
+    cache = src.with_name(f"{src.stem}.h{header}.parquet")
+    if cache.exists() and cache.stat().st_mtime > src.stat().st_mtime:
+        return pd.read_parquet(cache, engine="pyarrow")
+
+    df = pd.read_excel(src, header=header, engine="openpyxl")
     try:
-        return str(float(s))
-    except ValueError:
-        return None
+        df.to_parquet(cache, engine="pyarrow", compression="zstd")
+    except Exception as e:   # e.g. mixed-type column Arrow can't store
+        print(f"    ⚠ not caching {src.name}: {e}")
+        cache.unlink(missing_ok=True)
+    return df
+
+
+# ── Column-wise cleaning (one pass per column) ────────────────────────────
+
+def _src(df: pd.DataFrame, col: str) -> pd.Series:
+    if col in df.columns:
+        return df[col]
+    return pd.Series(pd.NA, index=df.index, dtype="object")
+
+
+def clean_str(s: pd.Series, maxlen: int = 255) -> pd.Series:
+    s = s.astype("string").str.strip().str[:maxlen]
+    return s.mask(s == "")
+
+
+def clean_num(s: pd.Series) -> pd.Series:
+    s = s.astype("string").str.replace(_CUR_RE, "", regex=True)
+    return pd.to_numeric(s, errors="coerce").astype("float64")
+
+
+def clean_date(s: pd.Series) -> pd.Series:
+    if pd.api.types.is_datetime64_any_dtype(s):
+        return s.dt.strftime("%Y-%m-%d")
+    s = s.astype("string").str.strip().str[:10]
+    out = pd.Series(pd.NaT, index=s.index, dtype="datetime64[ns]")
+    for fmt in _DATE_FMTS:   # first format that parses wins
+        out = out.fillna(pd.to_datetime(s, format=fmt, errors="coerce"))
+    return out.dt.strftime("%Y-%m-%d")
+
+
+_CLEANERS = {"text": clean_str, "status": clean_str, "date": clean_date, "num": clean_num}
+
+
+def clean_frame(df: pd.DataFrame, fields: list[tuple[str, str, str]]) -> pd.DataFrame:
+    """Source frame → one cleaned column per destination title (NA = skip)."""
+    return pd.DataFrame(
+        {dst: _CLEANERS[kind](_src(df, src)) for kind, src, dst in fields},
+        index=df.index,
+    )
+
+
+def build_items(clean: pd.DataFrame, names: pd.Series,
+                fields: list[tuple[str, str, str]],
+                col_ids: dict[str, str]) -> list[tuple[str, dict]]:
+    """(name, create_item column_values) per cleaned row."""
+    # Resolve board columns once; rows are then plain tuples (no per-row Series)
+    targets = [
+        (pos, col_ids[dst], kind)
+        for pos, (kind, _, dst) in enumerate(fields) if dst in col_ids
+    ]
+    rows = clean.astype(object).where(clean.notna(), None)
+    items: list[tuple[str, dict]] = []
+    for name, vals in zip(names.tolist(), rows.itertuples(index=False, name=None)):
+        cv: dict = {}
+        for pos, cid, kind in targets:
+            v = vals[pos]
+            if v is None:
+                continue
+            if kind == "status":
+                v = {"label": v}
+            elif kind == "date":
+                v = {"date": v}
+            elif kind == "num":
+                v = str(v)
+            cv[cid] = v
+        items.append((name, cv))
+    return items
 
 
 # ── Deals ──────────────────────────────────────────────────────────────────
@@ -127,20 +258,30 @@ DEALS_COLUMNS = [
     ("Created Date",         "date"),
 ]
 
-def import_deals(api_key: str, workspace_id: str, path: str) -> str:
+# (kind, spreadsheet column, board column)
+DEALS_FIELDS = [
+    ("text",   "Owner code",           "Owner Code"),
+    ("text",   "Client Code",          "Client Code"),
+    ("status", "Deal Status",          "Deal Status"),
+    ("date",   "Close Date (A)",       "Close Date (Actual)"),
+    ("status", "Closure Probability",  "Closure Probability"),
+    ("num",    "Masked Deal value",    "Deal Value (₹ Masked)"),
+    ("date",   "Tentative Close Date", "Tentative Close Date"),
+    ("status", "Deal Stage",           "Deal Stage"),
+    ("text",   "Product deal",         "Product"),
+    ("text",   "Sector/service",       "Sector"),
+    ("date",   "Created Date",         "Created Date"),
+]
+
+async def import_deals(client: httpx.AsyncClient, workspace_id: str, path: str) -> str:
     print("\n📋 Creating 'Deal Funnel' board…")
-    board_id = create_board(api_key, workspace_id, "Deal Funnel")
+    board_id = await create_board(client, workspace_id, "Deal Funnel")
     print(f"   Board ID: {board_id}")
 
     print("   Creating columns…")
-    col_ids: dict[str, str] = {}
-    for title, ctype in DEALS_COLUMNS:
-        cid = create_column(api_key, board_id, title, ctype)
-        if cid:
-            col_ids[title] = cid
-        time.sleep(0.25)
+    col_ids = await create_columns(client, board_id, DEALS_COLUMNS)
 
-    df = pd.read_excel(path)
+    df = load_sheet(path)
     # Drop sentinel header rows
     for col, bad in [("Deal Status", "Deal Status"), ("Deal Stage", "Deal Stage"),
                      ("Sector/service", "Sector/service")]:
@@ -149,40 +290,12 @@ def import_deals(api_key: str, workspace_id: str, path: str) -> str:
     df = df.reset_index(drop=True)
     print(f"   Importing {len(df)} deals…")
 
-    ok = fail = 0
-    for _, row in df.iterrows():
-        cv: dict = {}
-        def text(src, dst):
-            v = safe_str(row.get(src))
-            if v and dst in col_ids: cv[col_ids[dst]] = v
-        def date(src, dst):
-            v = safe_date(row.get(src))
-            if v and dst in col_ids: cv[col_ids[dst]] = v
-        def num(src, dst):
-            v = safe_num(row.get(src))
-            if v and dst in col_ids: cv[col_ids[dst]] = v
-        def status(src, dst):
-            v = safe_str(row.get(src))
-            if v and dst in col_ids: cv[col_ids[dst]] = {"label": v}
-
-        text("Owner code",         "Owner Code")
-        text("Client Code",        "Client Code")
-        status("Deal Status",      "Deal Status")
-        date("Close Date (A)",     "Close Date (Actual)")
-        status("Closure Probability", "Closure Probability")
-        num("Masked Deal value",   "Deal Value (₹ Masked)")
-        date("Tentative Close Date", "Tentative Close Date")
-        status("Deal Stage",       "Deal Stage")
-        text("Product deal",       "Product")
-        text("Sector/service",     "Sector")
-        date("Created Date",       "Created Date")
-
-        name = safe_str(row.get("Deal Name")) or f"Deal_{_}"
-        if create_item(api_key, board_id, name, cv):
-            ok += 1
-        else:
-            fail += 1
-        time.sleep(0.18)
+    clean = clean_frame(df, DEALS_FIELDS)
+    names = clean_str(_src(df, "Deal Name"))
+    names = names.fillna(pd.Series([f"Deal_{i}" for i in df.index], index=df.index))
+
+    items = build_items(clean, names, DEALS_FIELDS, col_ids)
+    ok, fail = await create_items(client, board_id, items)
 
     print(f"   ✅ {ok} imported | {fail} failed")
     return board_id
@@ -209,62 +322,44 @@ WO_COLUMNS = [
     ("Personnel Code",       "text"),
 ]
 
-def import_workorders(api_key: str, workspace_id: str, path: str) -> str:
+# (kind, spreadsheet column, board column)
+WO_FIELDS = [
+    ("text",   "Customer Name Code",        "Customer Code"),
+    ("text",   "Serial #",                  "Serial #"),
+    ("text",   "Nature of Work",            "Nature of Work"),
+    ("status", "Execution Status",          "Execution Status"),
+    ("date",   "Data Delivery Date",        "Data Delivery Date"),
+    ("date",   "Date of PO/LOI",            "Date of PO/LOI"),
+    ("text",   "Sector",                    "Sector"),
+    ("text",   "Type of Work",              "Type of Work"),
+    ("num",    "Amount in Rupees (Excl of GST) (Masked)",            "Amount Excl GST (₹)"),
+    ("num",    "Amount in Rupees (Incl of GST) (Masked)",            "Amount Incl GST (₹)"),
+    ("num",    "Billed Value in Rupees (Incl of GST.) (Masked)",     "Billed Incl GST (₹)"),
+    ("num",    "Collected Amount in Rupees (Incl of GST.) (Masked)", "Collected (₹)"),
+    ("num",    "Amount Receivable (Masked)", "Receivable (₹)"),
+    ("status", "WO Status (billed)",        "WO Status"),
+    ("status", "Billing Status",            "Billing Status"),
+    ("text",   "BD/KAM Personnel code",     "Personnel Code"),
+]
+
+async def import_workorders(client: httpx.AsyncClient, workspace_id: str, path: str) -> str:
     print("\n📋 Creating 'Work Order Tracker' board…")
-    board_id = create_board(api_key, workspace_id, "Work Order Tracker")
+    board_id = await create_board(client, workspace_id, "Work Order Tracker")
     print(f"   Board ID: {board_id}")
 
     print("   Creating columns…")
-    col_ids: dict[str, str] = {}
-    for title, ctype in WO_COLUMNS:
-        cid = create_column(api_key, board_id, title, ctype)
-        if cid:
-            col_ids[title] = cid
-        time.sleep(0.25)
+    col_ids = await create_columns(client, board_id, WO_COLUMNS)
 
-    df = pd.read_excel(path, header=1)
+    df = load_sheet(path, header=1)
     df = df.dropna(how="all").reset_index(drop=True)
     print(f"   Importing {len(df)} work orders…")
 
-    ok = fail = 0
-    for _, row in df.iterrows():
-        cv: dict = {}
-        def text(src, dst):
-            v = safe_str(row.get(src))
-            if v and dst in col_ids: cv[col_ids[dst]] = v
-        def date(src, dst):
-            v = safe_date(row.get(src))
-            if v and dst in col_ids: cv[col_ids[dst]] = v
-        def num(src, dst):
-            v = safe_num(row.get(src))
-            if v and dst in col_ids: cv[col_ids[dst]] = v
-        def status(src, dst):
-            v = safe_str(row.get(src))
-            if v and dst in col_ids: cv[col_ids[dst]] = {"label": v}
-
-        text("Customer Name Code",           "Customer Code")
-        text("Serial #",                     "Serial #")
-        text("Nature of Work",               "Nature of Work")
-        status("Execution Status",           "Execution Status")
-        date("Data Delivery Date",           "Data Delivery Date")
-        date("Date of PO/LOI",               "Date of PO/LOI")
-        text("Sector",                       "Sector")
-        text("Type of Work",                 "Type of Work")
-        num("Amount in Rupees (Excl of GST) (Masked)", "Amount Excl GST (₹)")
-        num("Amount in Rupees (Incl of GST) (Masked)", "Amount Incl GST (₹)")
-        num("Billed Value in Rupees (Incl of GST.) (Masked)", "Billed Incl GST (₹)")
-        num("Collected Amount in Rupees (Incl of GST.) (Masked)", "Collected (₹)")
-        num("Amount Receivable (Masked)",    "Receivable (₹)")
-        status("WO Status (billed)",         "WO Status")
-        status("Billing Status",             "Billing Status")
-        text("BD/KAM Personnel code",        "Personnel Code")
-
-        name = safe_str(row.get("Deal name masked")) or f"WO_{_}"
-        if create_item(api_key, board_id, name, cv):
-            ok += 1
-        else:
-            fail += 1
-        time.sleep(0.18)
+    clean = clean_frame(df, WO_FIELDS)
+    names = clean_str(_src(df, "Deal name masked"))
+    names = names.fillna(pd.Series([f"WO_{i}" for i in df.index], index=df.index))
+
+    items = build_items(clean, names, WO_FIELDS, col_ids)
+    ok, fail = await create_items(client, board_id, items)
 
     print(f"   ✅ {ok} imported | {fail} failed")
     return board_id
@@ -272,7 +367,7 @@ def import_workorders(api_key: str, workspace_id: str, path: str) -> str:
 
 # ── Main ───────────────────────────────────────────────────────────────────
 
-def main():
+async def main_async():
     p = argparse.ArgumentParser(description="Import Skylark data into Monday.com")
     p.add_argument("--api-key",    required=True)
     p.add_argument("--workspace",  required=True)
@@ -289,8 +384,9 @@ def main():
         print(f"❌ File not found: {args.wo_file}")
         sys.exit(1)
 
-    deals_id = import_deals(args.api_key, args.workspace, args.deals_file)
-    wo_id    = import_workorders(args.api_key, args.workspace, args.wo_file)
+    async with make_client(args.api_key) as client:
+        deals_id = await import_deals(client, args.workspace, args.deals_file)
+        wo_id    = await import_workorders(client, args.workspace, args.wo_file)
 
     print("\n" + "="*52)
     print("✅  IMPORT COMPLETE — add to your .env:")
@@ -301,4 +397,4 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
+    asyncio.run(main_async())